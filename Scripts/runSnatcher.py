@@ -1,9 +1,9 @@
 import os
 import re
-import requests
 import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
+
 from playwright.sync_api import sync_playwright
 
 # Base tile URL prefix
@@ -13,40 +13,41 @@ OUTPUT_DIR = "../tiles"
 _downloaded = set()
 _tile_path_re = re.compile(re.escape(BASE_PREFIX) + r'([0-9A-Za-z_\-./]+\.webp)')
 
-executor = ThreadPoolExecutor(max_workers=10)
+# Disk writes happen off the route-handler thread so tile delivery to the
+# page is never blocked on IO.
+_write_pool = ThreadPoolExecutor(max_workers=4)
+
 lock = threading.Lock()
 last_tile_time = time.time()
 
-def download_tile(url: str):
+def _write_file(path, data):
     global last_tile_time
-    with lock:
-        if url in _downloaded:
-            return
-        _downloaded.add(url)
-    rel_path_match = _tile_path_re.match(url)
-    if not rel_path_match:
-        return
-    rel_path = rel_path_match.group(1)
-    local_path = os.path.join(OUTPUT_DIR, rel_path)
-    os.makedirs(os.path.dirname(local_path), exist_ok=True)
-
     try:
-        resp = requests.get(url, stream=True, timeout=15)
-        resp.raise_for_status()
-        with open(local_path, "wb") as f:
-            for chunk in resp.iter_content(8192):
-                f.write(chunk)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
         with lock:
             last_tile_time = time.time()
-        print(f"Downloaded: {local_path}")
+        print(f"Saved: {path}")
     except Exception as e:
-        print(f"Failed {url}: {e}")
+        print(f"Failed {path}: {e}")
 
-def schedule_download(url: str):
-    executor.submit(download_tile, url)
+def handle_tile(route):
+    """Fetch the tile once through the browser's warm connection, copy the
+    body to disk, and hand the same response back to the page. No second
+    download and no separate TLS handshake per tile."""
+    response = route.fetch()
+    url = route.request.url
+    rel_path_match = _tile_path_re.match(url)
+    if rel_path_match and url not in _downloaded:
+        _downloaded.add(url)
+        local_path = os.path.join(OUTPUT_DIR, rel_path_match.group(1))
+        _write_pool.submit(_write_file, local_path, response.body())
+    route.fulfill(response=response)
 
 def monitor_idle(timeout=30):
     """Alert if no new tile in timeout seconds."""
+    global last_tile_time
     while True:
         time.sleep(1)
         with lock:
@@ -66,9 +67,8 @@ def main():
         )
         page = browser.new_page(viewport=None)  # None = use full screen
 
-        # Capture tile requests
-        page.on("request", lambda request: schedule_download(request.url)
-                if request.url.startswith(BASE_PREFIX) else None)
+        # Intercept tile requests instead of re-downloading them ourselves
+        page.route(f"{BASE_PREFIX}**", handle_tile)
 
         print("Opening DayZ map page in full-screen...")
         page.goto(
@@ -85,7 +85,7 @@ def main():
             print("Exiting...")
 
         browser.close()
-        executor.shutdown(wait=True)
+        _write_pool.shutdown(wait=True)
         print("Done. All captured tiles have been downloaded.")
 
 if __name__ == "__main__":
@@ -1,40 +1,273 @@
 import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
 import pygame
 import numpy as np
 
 TILE_DIR = "tiles"
 TILE_SIZE = 256
+SCALED_CACHE_MAX = 512  # max scaled-tile surfaces kept alive (LRU)
+TILE_CACHE_MAX = 256    # decoded tiles kept alive per variant (LRU)
+
+# Shared decode pool: prewarm fires once per frame while panning into
+# unseen territory, so the workers are created once here instead of a
+# fresh executor being built and joined in the hot path.
+DECODE_POOL = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1))
 START_ZOOM = 2
 MIN_ZOOM = 4
 MAX_ZOOM = 5
 SMOOTH_SPEED = 0.2  # smooth pan & zoom speed
 
+# fblits is the fastest batched blit (pygame-ce); fall back to blits on stock pygame
+if hasattr(pygame.Surface, "fblits"):
+    def blit_batch(surface, seq):
+        surface.fblits(seq)
+else:
+    def blit_batch(surface, seq):
+        surface.blits(seq, doreturn=0)
+
 # ----------------------------------------------------------
 # LOAD TILES
 # ----------------------------------------------------------
-def load_tiles(zoom):
-    tiles = {}
+# On pygame-ce the invert + desaturate can stay entirely inside SDL's C
+# blitters: subtract the tile from white, then run the SIMD grayscale.
+if hasattr(pygame.transform, "grayscale"):
+    def invert_tile(surf):
+        """Return an inverted-grayscale copy of a tile surface."""
+        inv = pygame.Surface(surf.get_size())
+        inv.fill((255, 255, 255))
+        inv.blit(surf, (0, 0), special_flags=pygame.BLEND_RGB_SUB)
+        return pygame.transform.grayscale(inv)
+else:
+    def invert_tile(surf):
+        """Return an inverted-grayscale copy of a tile surface."""
+        inv = surf.copy()
+        arr = pygame.surfarray.pixels3d(inv)
+        # Integer Rec.601 weights + shift: perceptually better gray than a
+        # flat average and still a single uint16 pass.
+        a = arr.astype(np.uint16)
+        gray = ((77 * (255 - a[..., 0])
+                 + 150 * (255 - a[..., 1])
+                 + 29 * (255 - a[..., 2])) >> 8).astype(np.uint8)
+        arr[..., 0] = gray
+        arr[..., 1] = gray
+        arr[..., 2] = gray
+        del arr
+        return inv
+
+def index_tiles(zoom):
+    """Scan a zoom directory without decoding any image data.
+
+    Returns (paths, bounds, tile_xs, tile_ys): a (x, y) -> file path dict,
+    the cached (min_x, max_x, min_y, max_y) bounds (None when empty) and
+    parallel int32 index arrays for vectorized visibility culling.
+    scandir DirEntry objects carry cached stat info, so is_dir() and
+    .path cost no extra syscalls the way listdir + isdir + join did.
+    """
+    paths = {}
+    empty = np.empty(0, dtype=np.int32)
     zoom_dir = os.path.join(TILE_DIR, str(zoom))
     if not os.path.exists(zoom_dir):
-        return tiles
-    for x_name in os.listdir(zoom_dir):
-        x_path = os.path.join(zoom_dir, x_name)
-        if not os.path.isdir(x_path):
-            continue
-        for y_name in os.listdir(x_path):
-            if not y_name.endswith(".webp"):
+        return paths, None, empty, empty
+    with os.scandir(zoom_dir) as x_iter:
+        for x_entry in x_iter:
+            if not x_entry.is_dir():
                 continue
-            y_path = os.path.join(x_path, y_name)
             try:
-                x_index = int(x_name)
-                y_index = int(y_name.replace(".webp", ""))
+                x_index = int(x_entry.name)
             except ValueError:
                 continue
-            try:
-                tiles[(x_index, y_index)] = pygame.image.load(y_path).convert_alpha()
-            except Exception as e:
-                print(f"Failed to load {y_path}: {e}")
-    return tiles
+            with os.scandir(x_entry.path) as y_iter:
+                for y_entry in y_iter:
+                    if not y_entry.name.endswith(".webp"):
+                        continue
+                    try:
+                        y_index = int(y_entry.name[:-len(".webp")])
+                    except ValueError:
+                        continue
+                    paths[(x_index, y_index)] = y_entry.path
+    if not paths:
+        return paths, None, empty, empty
+    tile_xs = np.fromiter((x for x, y in paths.keys()), dtype=np.int32, count=len(paths))
+    tile_ys = np.fromiter((y for x, y in paths.keys()), dtype=np.int32, count=len(paths))
+    bounds = (int(tile_xs.min()), int(tile_xs.max()), int(tile_ys.min()), int(tile_ys.max()))
+    return paths, bounds, tile_xs, tile_ys
+
+def compute_visible_tiles(tile_xs, tile_ys, bounds, zoom_scale, off_x, off_y, w, h):
+    """Return (vis_x, vis_y, pxs, pys) for the tiles inside a w*h viewport.
+
+    One vectorized mask over the parallel index arrays plus one ufunc
+    pass for the pixel positions — the caller's Python loop only has to
+    assemble the blit list. Kept as plain numpy: the arrays are small
+    enough that a JIT would spend more on compilation than it saves.
+    """
+    min_x, max_x, min_y, max_y = bounds
+    tile_span = TILE_SIZE * zoom_scale
+    start_x = max(min_x, int(-off_x / tile_span))
+    end_x = min(max_x, int((w - off_x) / tile_span) + 1)
+    start_y = max(min_y, int(-off_y / tile_span))
+    end_y = min(max_y, int((h - off_y) / tile_span) + 1)
+    visible = ((tile_xs >= start_x) & (tile_xs <= end_x)
+               & (tile_ys >= start_y) & (tile_ys <= end_y))
+    vis_x = tile_xs[visible]
+    vis_y = tile_ys[visible]
+    pxs = (vis_x * tile_span + off_x).astype(np.int32)
+    pys = (vis_y * tile_span + off_y).astype(np.int32)
+    return vis_x, vis_y, pxs, pys
+
+def render_map(surface_rect, map_surface, tile_store, tile_bounds, tile_xs, tile_ys,
+               zoom_scale, offset_x, offset_y, scaled_tiles_cache,
+               grid_overlay_cache, show_hud=True, inverted=False):
+    """Render the visible tiles (and HUD grid) into map_surface.
+
+    Module-level on purpose: every former closure variable is an explicit
+    parameter, so the hot loop reads locals (LOAD_FAST) instead of
+    closure cells, and the function object isn't rebuilt per frame.
+    """
+    # Inverted maps blit the cached inverted-gray tiles, so the
+    # background just needs the inverted shade of the normal gray.
+    map_surface.fill((185, 185, 185) if inverted else (70, 70, 70))
+    if tile_store:
+        # Build one blit list and push it through a single batched call
+        # instead of one Python-level blit per tile. Missing tiles need
+        # no work: the background fill above is already the gray fallback.
+        # Cache scaled tiles by their integer pixel size, not by raw
+        # zoom_float: intermediate smooth-zoom frames that land on the
+        # same pixel size now reuse the same surface instead of
+        # re-running smoothscale.
+        tile_px = int(TILE_SIZE * zoom_scale)
+        # At native zoom (the steady state once the lerp settles) the
+        # tiles need no scaling at all — blit the originals.
+        native = abs(zoom_scale - 1.0) < 1e-3
+        vis_x, vis_y, pxs, pys = compute_visible_tiles(
+            tile_xs, tile_ys, tile_bounds, zoom_scale,
+            offset_x, offset_y, surface_rect.width, surface_rect.height)
+        keys = list(zip(vis_x.tolist(), vis_y.tolist()))
+        # Decode any not-yet-loaded visible tiles in parallel before
+        # the blit loop touches them one by one.
+        tile_store.prewarm(keys)
+        # Non-native sizes only exist mid-animation (the lerp always settles
+        # on an integer zoom, i.e. native), so nearest-neighbor scale is
+        # fine: it's 2-4x cheaper than smoothscale and the frames are
+        # transient anyway.
+        _scale = pygame.transform.scale
+        blit_list = []
+        for (x, y), px, py in zip(keys, pxs.tolist(), pys.tolist()):
+            surf = tile_store.get(x, y, inverted)
+            if surf is None:
+                continue
+            if native:
+                blit_list.append((surf, (px, py)))
+                continue
+            key = (x, y, tile_px, inverted)
+            scaled = scaled_tiles_cache.get(key)
+            if scaled is None:
+                scaled = _scale(surf, (tile_px, tile_px))
+                scaled_tiles_cache[key] = scaled
+                while len(scaled_tiles_cache) > SCALED_CACHE_MAX:
+                    scaled_tiles_cache.popitem(last=False)
+            else:
+                scaled_tiles_cache.move_to_end(key)
+            blit_list.append((scaled, (px, py)))
+        blit_batch(map_surface, blit_list)
+        if show_hud:
+            # Dotted grid: the line pattern only depends on the tile
+            # pixel size and the offsets modulo one tile, so draw it
+            # once into a transparent overlay and reuse it — one blit
+            # per frame instead of a dash-by-dash Python loop.
+            ox_mod = int(offset_x) % tile_px
+            oy_mod = int(offset_y) % tile_px
+            gkey = (tile_px, ox_mod, oy_mod, surface_rect.width, surface_rect.height)
+            overlay = grid_overlay_cache.get(gkey)
+            if overlay is None:
+                overlay = pygame.Surface(surface_rect.size, pygame.SRCALPHA)
+                for px in range(ox_mod - tile_px, surface_rect.width + tile_px, tile_px):
+                    draw_dotted_line(overlay, (0, 0, 0), (px, 0), (px, surface_rect.height))
+                for py in range(oy_mod - tile_px, surface_rect.height + tile_px, tile_px):
+                    draw_dotted_line(overlay, (0, 0, 0), (0, py), (surface_rect.width, py))
+                if len(grid_overlay_cache) > 32:
+                    grid_overlay_cache.clear()
+                grid_overlay_cache[gkey] = overlay
+            map_surface.blit(overlay, (0, 0))
+    return map_surface
+
+class TileStore:
+    """Lazy tile loader for one zoom level with a bounded LRU cache.
+
+    Startup and zoom switches only pay for the directory scan; tiles are
+    decoded the first time they become visible (the render loop prewarms
+    the visible set in parallel) and evicted least-recently-used, so
+    memory stays bounded however deep the session gets. The inverted
+    variant is derived on demand and cached the same way.
+    """
+
+    def __init__(self, zoom):
+        self.zoom = zoom
+        self.paths, self.bounds, self.xs, self.ys = index_tiles(zoom)
+        self.cache = OrderedDict()      # (x, y) -> Surface
+        self.cache_inv = OrderedDict()  # (x, y) -> inverted Surface
+
+    def __bool__(self):
+        return bool(self.paths)
+
+    @staticmethod
+    def _trim(cache):
+        while len(cache) > TILE_CACHE_MAX:
+            cache.popitem(last=False)
+
+    def _decode(self, key):
+        try:
+            return pygame.image.load(self.paths[key])
+        except Exception as e:
+            print(f"Failed to load {self.paths[key]}: {e}")
+            return None
+
+    def prewarm(self, keys):
+        """Decode any not-yet-cached tiles among keys in a thread pool.
+
+        The webp decode releases the GIL, so disk IO and decoding overlap
+        across cores; display-format conversion stays on the main thread
+        with the SDL context.
+        """
+        missing = [k for k in keys if k not in self.cache and k in self.paths]
+        if len(missing) < 2:
+            return  # nothing to parallelize
+        for key, surf in zip(missing, DECODE_POOL.map(self._decode, missing)):
+            if surf is not None:
+                # Map tiles are fully opaque, so convert() to the display
+                # format without an alpha channel: blits take the fast
+                # opaque path instead of per-pixel alpha composition.
+                self.cache[key] = surf.convert()
+        self._trim(self.cache)
+
+    def get(self, x, y, inverted=False):
+        """Return the (possibly inverted) tile surface, or None if missing."""
+        key = (x, y)
+        if inverted:
+            surf = self.cache_inv.get(key)
+            if surf is not None:
+                self.cache_inv.move_to_end(key)
+                return surf
+        base = self.cache.get(key)
+        if base is None:
+            if key not in self.paths:
+                return None
+            raw = self._decode(key)
+            if raw is None:
+                return None
+            base = raw.convert()
+            self.cache[key] = base
+            self._trim(self.cache)
+        else:
+            self.cache.move_to_end(key)
+        if not inverted:
+            return base
+        inv = invert_tile(base)
+        self.cache_inv[key] = inv
+        self._trim(self.cache_inv)
+        return inv
 
 # ----------------------------------------------------------
 # DOTTED LINE DRAWER
@@ -47,12 +280,16 @@ def draw_dotted_line(surface, color, start, end, dash_length=10):
         return
     dx = (x2 - x1) / length
     dy = (y2 - y1) / length
-    for i in range(0, length, dash_length * 2):
-        sx = int(x1 + dx * i)
-        sy = int(y1 + dy * i)
-        ex = int(x1 + dx * (i + dash_length))
-        ey = int(y1 + dy * (i + dash_length))
-        pygame.draw.line(surface, color, (sx, sy), (ex, ey))
+    # Compute every dash endpoint in a few ufunc passes instead of four
+    # float multiplies + int casts per dash in Python.
+    steps = np.arange(0, length, dash_length * 2)
+    sxs = (x1 + dx * steps).astype(np.int32)
+    sys_ = (y1 + dy * steps).astype(np.int32)
+    exs = (x1 + dx * (steps + dash_length)).astype(np.int32)
+    eys = (y1 + dy * (steps + dash_length)).astype(np.int32)
+    line = pygame.draw.line
+    for sx, sy, ex, ey in zip(sxs.tolist(), sys_.tolist(), exs.tolist(), eys.tolist()):
+        line(surface, color, (sx, sy), (ex, ey))
 
 # ----------------------------------------------------------
 # HELPERS
@@ -60,19 +297,26 @@ def draw_dotted_line(surface, color, start, end, dash_length=10):
 def lerp(a, b, t):
     return a + (b - a) * t
 
-def clamp_offset(offset_x, offset_y, tiles, viewport_w, viewport_h, zoom_scale=1.0):
-    if not tiles:
-        return offset_x, offset_y
-    xs = [x for x, y in tiles.keys()]
-    ys = [y for x, y in tiles.keys()]
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
-    map_w = (max_x - min_x + 1) * TILE_SIZE * zoom_scale
-    map_h = (max_y - min_y + 1) * TILE_SIZE * zoom_scale
+@lru_cache(maxsize=32)
+def _offset_limits(bounds, viewport_w, viewport_h, zoom_scale):
+    """Pure: the four pan-offset limits for a (bounds, viewport, zoom) combo.
+
+    During a pan drag zoom_scale sits on a single settled value, so the
+    MOUSEMOTION storm hits this cache instead of redoing the multiplies.
+    """
+    min_x, max_x, min_y, max_y = bounds
     max_x_off = -min_x * TILE_SIZE * zoom_scale
     min_x_off = viewport_w - ((max_x + 1) * TILE_SIZE * zoom_scale)
     max_y_off = -min_y * TILE_SIZE * zoom_scale
     min_y_off = viewport_h - ((max_y + 1) * TILE_SIZE * zoom_scale)
+    return min_x_off, max_x_off, min_y_off, max_y_off
+
+def clamp_offset(offset_x, offset_y, bounds, viewport_w, viewport_h, zoom_scale=1.0):
+    """Clamp pan offsets to the map edges. O(1): bounds come from the tile index."""
+    if bounds is None:
+        return offset_x, offset_y
+    min_x_off, max_x_off, min_y_off, max_y_off = _offset_limits(
+        bounds, viewport_w, viewport_h, zoom_scale)
     return max(min_x_off, min(max_x_off, offset_x)), max(min_y_off, min(max_y_off, offset_y))
 
 # ----------------------------------------------------------
@@ -154,7 +398,15 @@ def create_marker_surface(size=32):
 # ----------------------------------------------------------
 def main():
     pygame.init()
-    screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    # SCALED routes drawing through the SDL2 renderer (GPU blits) and lets us
+    # ask for vsync; it refuses a (0, 0) size, so ask for the desktop
+    # resolution explicitly. Fall back to the plain software mode if
+    # unsupported.
+    try:
+        desktop_size = pygame.display.get_desktop_sizes()[0]
+        screen = pygame.display.set_mode(desktop_size, pygame.FULLSCREEN | pygame.SCALED, vsync=1)
+    except pygame.error:
+        screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
     screen_w, screen_h = screen.get_size()
     pygame.display.set_caption("DayZ Tile Dashboard - Floating Windows with Markers")
 
@@ -166,12 +418,19 @@ def main():
     small_font = pygame.font.SysFont("Consolas", 14, bold=True)
 
     current_zoom = START_ZOOM
-    tiles = load_tiles(current_zoom)
-    scaled_tiles_cache = {}
+    tile_store = TileStore(current_zoom)
+    tile_bounds = tile_store.bounds
+    tile_xs, tile_ys = tile_store.xs, tile_store.ys
+    scaled_tiles_cache = OrderedDict()  # (x, y, tile_px) -> Surface, LRU-bounded
+    grid_overlay_cache = {}  # (tile_px, ox_mod, oy_mod, w, h) -> grid Surface
 
     # Offsets and zoom
     offset_x = offset_y = target_offset_x = target_offset_y = 0.0
-    zoom_float = target_zoom = float(current_zoom)
+    # Start inside the [MIN_ZOOM, MAX_ZOOM] clamp range: the per-frame
+    # clamp pins zoom_float there, and a target outside it would keep
+    # |zoom_float - target_zoom| above the animation threshold forever,
+    # holding the dirty flag on while the dashboard sits idle.
+    zoom_float = target_zoom = float(max(MIN_ZOOM, min(MAX_ZOOM, current_zoom)))
     dragging_map = False
     drag_start = drag_offset_start = (0, 0)
 
@@ -180,9 +439,17 @@ def main():
     invert_large = True  # Which map starts inverted
 
     # Log system
-    # Now entries store: (x_tile_float, y_tile_float, zoom_at_save (float), comment)
+    # Now entries store: (x_tile_float, y_tile_float, zoom_at_save (float), comment, text_surf)
+    # text_surf is rendered once when the entry is added — entries are
+    # immutable, so the draw loop never has to re-rasterize them.
     log_entries = []  # list of tuples described above
-    markers = []      # list of dicts: {"x":..., "y":..., "zoom":..., "id":..., "comment":...}
+    # Markers live as parallel arrays (structure-of-arrays), not a list of
+    # dicts: per-frame pixel positions for every marker come out of one
+    # vectorized numpy expression instead of a dict-lookup loop.
+    marker_xs = np.array([], dtype=np.float32)
+    marker_ys = np.array([], dtype=np.float32)
+    marker_zooms = np.array([], dtype=np.float32)
+    marker_comments = []
     current_comment = ""
     typing_comment = False
     entry_rects = []
@@ -224,199 +491,248 @@ def main():
 
     active_window = None  # the window currently being dragged (if any)
 
-    while running:
-        screen.fill((50, 50, 50))  # Background (behind the map if wanted)
-        zoom_scale = zoom_float / current_zoom
-
-        # -----------------------
-        # Render large map (full screen)
-        # -----------------------
-        def render_map(surface_rect, show_hud=True, inverted=False):
-            map_surface = pygame.Surface(surface_rect.size)
-            map_surface.fill((70, 70, 70))
-            if tiles:
-                xs = [x for x, y in tiles.keys()]
-                ys = [y for x, y in tiles.keys()]
-                min_x, max_x = min(xs), max(xs)
-                min_y, max_y = min(ys), max(ys)
-                start_x = max(min_x, int(-target_offset_x / (TILE_SIZE * zoom_scale)))
-                end_x = min(max_x, int((surface_rect.width - target_offset_x) / (TILE_SIZE * zoom_scale)) + 1)
-                start_y = max(min_y, int(-target_offset_y / (TILE_SIZE * zoom_scale)))
-                end_y = min(max_y, int((surface_rect.height - target_offset_y) / (TILE_SIZE * zoom_scale)) + 1)
-                for x in range(start_x, end_x + 1):
-                    for y in range(start_y, end_y + 1):
-                        px = int(x * TILE_SIZE * zoom_scale + target_offset_x)
-                        py = int(y * TILE_SIZE * zoom_scale + target_offset_y)
-                        key = (x, y, int(zoom_float * 100))
-                        if (x, y) in tiles:
-                            if key not in scaled_tiles_cache:
-                                scaled_tiles_cache[key] = pygame.transform.smoothscale(
-                                    tiles[(x, y)],
-                                    (int(TILE_SIZE * zoom_scale), int(TILE_SIZE * zoom_scale))
-                                )
-                            map_surface.blit(scaled_tiles_cache[key], (px, py))
-                        else:
-                            rect = pygame.Rect(px, py, int(TILE_SIZE * zoom_scale), int(TILE_SIZE * zoom_scale))
-                            pygame.draw.rect(map_surface, (70, 70, 70), rect)
-                if show_hud:
-                    # Dotted grid
-                    for x in range(start_x, end_x + 1):
-                        px = int(x * TILE_SIZE * zoom_scale + target_offset_x)
-                        draw_dotted_line(map_surface, (0, 0, 0), (px, 0), (px, surface_rect.height))
-                    for y in range(start_y, end_y + 1):
-                        py = int(y * TILE_SIZE * zoom_scale + target_offset_y)
-                        draw_dotted_line(map_surface, (0, 0, 0), (0, py), (surface_rect.width, py))
-            if inverted:
-                arr = pygame.surfarray.pixels3d(map_surface)
-                np.subtract(255, arr, out=arr)
-                gray = arr.mean(axis=2, keepdims=True).astype(np.uint8)
-                arr[:] = gray
-                del arr
-            return map_surface
-
-        large_map = render_map(
-            large_rect, show_hud=True, 
-            # inverted=invert_enabled 
-            #     if invert_large 
-            #     else not invert_enabled
-            )
-
-        # Crosshair in center of large_map
-        cross_x = large_rect.width // 2
-        cross_y = large_rect.height // 2
-        box_size = 50
-        pygame.draw.line(large_map, (255, 0, 0), (cross_x - box_size, cross_y - box_size), (cross_x + box_size, cross_y - box_size), 2)
-        pygame.draw.line(large_map, (255, 0, 0), (cross_x - box_size, cross_y + box_size), (cross_x + box_size, cross_y + box_size), 2)
-        pygame.draw.line(large_map, (255, 0, 0), (cross_x - box_size, cross_y - box_size), (cross_x - box_size, cross_y + box_size), 2)
-        pygame.draw.line(large_map, (255, 0, 0), (cross_x + box_size, cross_y - box_size), (cross_x + box_size, cross_y + box_size), 2)
-
-        # Coordinate overlay on large_map
-        map_x = (cross_x - target_offset_x) / (TILE_SIZE * zoom_scale)
-        map_y = (cross_y - target_offset_y) / (TILE_SIZE * zoom_scale)
-        arrow_text = small_font.render(">", True, (255, 255, 0))
-        coord_text = small_font.render(f"X:{map_x:.2f}", True, (255, 0, 0))
-        coord_text2 = small_font.render(f"Y:{map_y:.2f}", True, (255, 0, 0))
-        large_map.blit(arrow_text, (cross_x + 2, cross_y - 15))
-        large_map.blit(coord_text, (cross_x + 15, cross_y - 15))
-        large_map.blit(coord_text2, (cross_x + 15, cross_y))
-
-        # blit the full-screen large_map to screen at (0,0)
-        screen.blit(large_map, large_rect.topleft)
-
-        # -----------------------
-        # Draw markers on the main map (use same math as render_map)
-        # -----------------------
-        # We draw markers after the map so they appear above tiles.
-        for m in markers:
-            # compute pixel position using current zoom_float/current_zoom and target_offset_x/y
-            px = int(m["x"] * TILE_SIZE * (zoom_float / current_zoom) + target_offset_x)
-            py = int(m["y"] * TILE_SIZE * (zoom_float / current_zoom) + target_offset_y)
-            # anchor the marker so its bottom center sits at px,py
-            blit_x = px - marker_anchor[0]
-            blit_y = py - marker_anchor[1]
-            screen.blit(marker_surf, (blit_x, blit_y))
+    # Reusable render targets: allocating a fresh full-screen Surface per
+    # render is a large malloc + memset we only need once.
+    large_map_surf = pygame.Surface(large_rect.size).convert()
+    mini_map_surf = pygame.Surface(
+        (small_window.rect.width, small_window.rect.height - small_window.title_height)).convert()
+
+    # Per-window content surfaces, allocated once and cleared per frame
+    # instead of constructed fresh every frame.
+    content_surfaces = {
+        w: pygame.Surface((w.rect.width, w.rect.height - w.title_height), pygame.SRCALPHA)
+        for w in windows
+    }
+
+    # The log window background (semi-transparent fill + centered logo with
+    # alpha already applied) never changes, so compose it once up front.
+    log_static_bg = pygame.Surface(content_surfaces[log_window].get_size(), pygame.SRCALPHA)
+    log_static_bg.fill((0, 0, 0, LOG_BG_ALPHA))
+    if log_bg_img:
+        img_copy = log_bg_img.copy()
+        img_copy.set_alpha(LOG_BG_ALPHA)
+        log_static_bg.blit(img_copy, (
+            (log_static_bg.get_width() - img_copy.get_width()) // 2,
+            (log_static_bg.get_height() - img_copy.get_height()) // 2))
+
+    # Cached map renders: only re-run render_map when the view actually
+    # changed (pan/zoom/invert). Idle frames reuse the last surfaces.
+    last_render_state = None
+    cached_large_map = None
+    cached_mini_map = None
+
+    current_cursor = None  # last cursor handed to SDL
+
+    # Typed-prompt surface, re-rendered only when the comment text changes
+    cached_prompt_text = None
+    cached_prompt_surf = None
+
+    # Dirty-flag rendering: the draw pass only runs on frames where input
+    # arrived or an animation is still converging. An idle dashboard does
+    # no compositing and no flip at all.
+    dirty = True
 
-        # -----------------------
-        # Draw floating windows (small map + log)
-        # -----------------------
-        # Draw windows in z-order (log first, then small map so small map can overlap)
-        for w in windows:
-            # Background content surface for the window contents (below title bar)
-            content_surface = pygame.Surface((w.rect.width, w.rect.height - w.title_height), pygame.SRCALPHA)
-            # Fill content depending on window
-            if w is small_window:
-                # Render the mini-map into the content surface
-                mini_rect = pygame.Rect(0, 0, content_surface.get_width(), content_surface.get_height())
-                mini_map = render_map(
-                    mini_rect, 
-                    show_hud=False, 
-                    inverted=invert_enabled 
-                        # if not invert_large 
-                        # else not invert_enabled
+    while running:
+        # Nothing changed since the last flip: the frame on screen is
+        # still correct, so skip the whole draw pass.
+        if dirty:
+            screen.fill((50, 50, 50))  # Background (behind the map if wanted)
+            zoom_scale = zoom_float / current_zoom
+
+            # -----------------------
+            # Render large map (full screen)
+            # -----------------------
+            # Quantize the state key: the lerp keeps nudging the offsets by
+            # sub-pixel amounts long after the view has visually settled, and
+            # every pixel position is int-cast anyway, so whole-pixel offsets
+            # (and millizoom) are exactly the resolution the render can show.
+            render_state = (int(offset_x), int(offset_y), round(zoom_float, 3),
+                            current_zoom, invert_enabled, invert_large)
+            if render_state != last_render_state:
+                cached_large_map = render_map(
+                    large_rect, large_map_surf, tile_store, tile_bounds,
+                    tile_xs, tile_ys, zoom_scale, offset_x, offset_y,
+                    scaled_tiles_cache, grid_overlay_cache, show_hud=True,
+                    # inverted=invert_enabled
+                    #     if invert_large
+                    #     else not invert_enabled
                     )
-                # draw crosshair at center of mini_map
-                cx = mini_rect.width // 2
-                cy = mini_rect.height // 2
-                pygame.draw.line(mini_map, (255, 0, 0), (cx - 10, cy), (cx + 10, cy), 2)
-                pygame.draw.line(mini_map, (255, 0, 0), (cx, cy - 10), (cx, cy + 10), 2)
-                pygame.draw.circle(mini_map, (255, 0, 0), (cx, cy), 12, 1)
-
-                # draw markers onto the mini_map as well (same coordinate math)
-                for m in markers:
-                    px = int(m["x"] * TILE_SIZE * (zoom_float / current_zoom) + target_offset_x)
-                    py = int(m["y"] * TILE_SIZE * (zoom_float / current_zoom) + target_offset_y)
-                    # mini_map is rendered into content_surface coords, so px/py are directly usable here
-                    # But only blit if inside mini_map bounds
-                    if 0 <= px < mini_rect.width and 0 <= py < mini_rect.height:
-                        blit_x = px - marker_anchor[0]
-                        blit_y = py - marker_anchor[1]
-                        mini_map.blit(marker_surf, (blit_x, blit_y))
-
-                content_surface.blit(mini_map, (0, 0))
-            elif w is log_window:
-                # Render the log entries inside the content area
-                # Semi-transparent background fill for content area (same alpha to be used also on image)
-                content_surface.fill((0, 0, 0, LOG_BG_ALPHA))
-
-                # Center the image (Option 1: no scaling)
-                if log_bg_img:
-                    try:
-                        img_copy = log_bg_img.copy()
-                        img_copy.set_alpha(LOG_BG_ALPHA)
-                        img_x = (content_surface.get_width() // 2) - (img_copy.get_width() // 2)
-                        img_y = (content_surface.get_height() // 2) - (img_copy.get_height() // 2)
-                        content_surface.blit(img_copy, (img_x, img_y))
-                    except Exception as e:
-                        print(f"Error drawing log bg image: {e}")
-
-                # Draw log text entries above background+image
-                entry_y = 8
-                entry_h = 18
-                mx, my = pygame.mouse.get_pos()
-                # Convert global mouse to window-local coords
-                local_mx = mx - w.rect.x
-                local_my = my - w.rect.y - w.title_height
-                entry_rects.clear()
-                # show last ~10 entries to keep it compact
-                for idx, (x_val, y_val, z_val, comment) in enumerate(log_entries[-10:]):
-                    text_surf = small_font.render(f"X:{x_val:.2f} Y:{y_val:.2f} Z:{z_val:.2f} {comment}", True, (230, 230, 230))
-                    rect = pygame.Rect(8, entry_y, content_surface.get_width() - 16, entry_h)
-                    content_surface.blit(text_surf, (rect.x, rect.y))
-                    # store global rect for clicking (map to screen coords)
-                    global_rect = pygame.Rect(rect.x + w.rect.x, rect.y + w.rect.y + w.title_height, rect.width, rect.height)
-                    entry_rects.append((global_rect, x_val, y_val, z_val, comment))
-                    entry_y += entry_h + 4
-
-                # Typing area at bottom
-                if typing_comment:
-                    prompt = small_font.render("> " + (current_comment if current_comment else "Write comment"), True, (255, 255, 0))
-                    content_surface.blit(prompt, (8, content_surface.get_height() - 24))
-
-            # Blit window background + title bar onto screen
-            w.draw(screen, font)
-            # Blit the content surface (this will include semi-transparent fill)
-            screen.blit(content_surface, (w.rect.x, w.rect.y + w.title_height))
-
-        # Mouse pointer handling (change cursor when over titlebar or entries)
-        mouse_x, mouse_y = pygame.mouse.get_pos()
-        cursor = pygame.SYSTEM_CURSOR_ARROW
-        for w in windows:
-            if w.title_bar_rect.collidepoint((mouse_x, mouse_y)):
-                cursor = pygame.SYSTEM_CURSOR_HAND
-                break
-        # If hovering a log entry
-        for rect, x_val, y_val, z_val, comment in entry_rects:
-            if rect.collidepoint((mouse_x, mouse_y)):
-                cursor = pygame.SYSTEM_CURSOR_HAND
-                break
-        pygame.mouse.set_system_cursor(cursor)
-
-        pygame.display.flip()
+                cached_mini_map = None  # mini map re-rendered lazily below
+                last_render_state = render_state
+            large_map = cached_large_map
+
+            # blit the full-screen large_map to screen at (0,0)
+            screen.blit(large_map, large_rect.topleft)
+
+            # Crosshair + coordinate readout go on the screen, not on the
+            # cached render: large_map is reused across frames, and the
+            # readout follows the raw float offsets even on frames where
+            # the quantized render_state doesn't change, so baking it into
+            # the cache would stack new digits over old ones.
+            cross_x = large_rect.width // 2
+            cross_y = large_rect.height // 2
+            box_size = 50
+            # One outlined rect draws the same box the four line calls did.
+            pygame.draw.rect(screen, (255, 0, 0),
+                             pygame.Rect(large_rect.x + cross_x - box_size,
+                                         large_rect.y + cross_y - box_size,
+                                         2 * box_size, 2 * box_size), 2)
+
+            map_x = (cross_x - offset_x) / (TILE_SIZE * zoom_scale)
+            map_y = (cross_y - offset_y) / (TILE_SIZE * zoom_scale)
+            arrow_text = small_font.render(">", True, (255, 255, 0))
+            coord_text = small_font.render(f"X:{map_x:.2f}", True, (255, 0, 0))
+            coord_text2 = small_font.render(f"Y:{map_y:.2f}", True, (255, 0, 0))
+            screen.blit(arrow_text,
+                        (large_rect.x + cross_x + 2, large_rect.y + cross_y - 15))
+            screen.blit(coord_text,
+                        (large_rect.x + cross_x + 15, large_rect.y + cross_y - 15))
+            screen.blit(coord_text2,
+                        (large_rect.x + cross_x + 15, large_rect.y + cross_y))
+
+            # -----------------------
+            # Draw markers on the main map (use same math as render_map)
+            # -----------------------
+            # We draw markers after the map so they appear above tiles.
+            # Cull off-screen markers in Python before pygame ever sees them,
+            # then push the survivors through one batched blit call.
+            marker_w, marker_h = marker_surf.get_size()
+            # One vectorized pass computes pixel positions for every marker;
+            # the mini-map pass below reuses the same vectors (both maps
+            # share offset and scale), so this happens once per frame.
+            marker_scale = TILE_SIZE * (zoom_float / current_zoom)
+            marker_pxs = (marker_xs * marker_scale + offset_x).astype(np.int32)
+            marker_pys = (marker_ys * marker_scale + offset_y).astype(np.int32)
+            # anchor so the marker bottom center sits on the coordinate
+            bxs = marker_pxs - marker_anchor[0]
+            bys = marker_pys - marker_anchor[1]
+            marker_blits = [
+                (marker_surf, (bx, by))
+                for bx, by in zip(bxs.tolist(), bys.tolist())
+                if -marker_w < bx < screen_w and -marker_h < by < screen_h
+            ]
+            blit_batch(screen, marker_blits)
+
+            # -----------------------
+            # Draw floating windows (small map + log)
+            # -----------------------
+            # Draw windows in z-order (log first, then small map so small map can overlap)
+            for w in windows:
+                # Reuse the preallocated content surface for this window
+                content_surface = content_surfaces[w]
+                content_surface.fill((0, 0, 0, 0))
+                # Fill content depending on window
+                if w is small_window:
+                    # Render the mini-map into the content surface
+                    mini_rect = pygame.Rect(0, 0, content_surface.get_width(), content_surface.get_height())
+                    if cached_mini_map is None:
+                        cached_mini_map = render_map(
+                            mini_rect, mini_map_surf, tile_store, tile_bounds,
+                            tile_xs, tile_ys, zoom_scale, offset_x, offset_y,
+                            scaled_tiles_cache, grid_overlay_cache,
+                            show_hud=False,
+                            inverted=invert_enabled
+                                # if not invert_large
+                                # else not invert_enabled
+                            )
+                    content_surface.blit(cached_mini_map, (0, 0))
+
+                    # Crosshair and markers are composited over the content
+                    # surface, not the cached render: cached_mini_map lives
+                    # across frames, and a marker shifting 1px during the
+                    # sub-pixel settle would leave a ghost baked into it.
+                    cx = mini_rect.width // 2
+                    cy = mini_rect.height // 2
+                    pygame.draw.line(content_surface, (255, 0, 0), (cx - 10, cy), (cx + 10, cy), 2)
+                    pygame.draw.line(content_surface, (255, 0, 0), (cx, cy - 10), (cx, cy + 10), 2)
+                    pygame.draw.circle(content_surface, (255, 0, 0), (cx, cy), 12, 1)
+
+                    # markers share the pixel vectors computed for the large
+                    # map pass; only blit the ones inside the window
+                    for px, py in zip(marker_pxs.tolist(), marker_pys.tolist()):
+                        if 0 <= px < mini_rect.width and 0 <= py < mini_rect.height:
+                            content_surface.blit(marker_surf,
+                                                 (px - marker_anchor[0],
+                                                  py - marker_anchor[1]))
+                elif w is log_window:
+                    # Render the log entries inside the content area.
+                    # The semi-transparent fill + centered logo were composed
+                    # into log_static_bg once at startup — one blit here.
+                    content_surface.blit(log_static_bg, (0, 0))
+
+                    # Draw log text entries above background+image
+                    entry_y = 8
+                    entry_h = 18
+                    mx, my = pygame.mouse.get_pos()
+                    # Convert global mouse to window-local coords
+                    local_mx = mx - w.rect.x
+                    local_my = my - w.rect.y - w.title_height
+                    entry_rects.clear()
+                    # show last ~10 entries to keep it compact
+                    for idx, (x_val, y_val, z_val, comment, text_surf) in enumerate(log_entries[-10:]):
+                        rect = pygame.Rect(8, entry_y, content_surface.get_width() - 16, entry_h)
+                        content_surface.blit(text_surf, (rect.x, rect.y))
+                        # store global rect for clicking (map to screen coords)
+                        global_rect = pygame.Rect(rect.x + w.rect.x, rect.y + w.rect.y + w.title_height, rect.width, rect.height)
+                        entry_rects.append((global_rect, x_val, y_val, z_val, comment))
+                        entry_y += entry_h + 4
+
+                    # Typing area at bottom: the prompt only changes on a
+                    # keystroke, so re-render it on text change, not per frame
+                    if typing_comment:
+                        prompt_text = "> " + (current_comment if current_comment else "Write comment")
+                        if prompt_text != cached_prompt_text:
+                            cached_prompt_surf = small_font.render(prompt_text, True, (255, 255, 0))
+                            cached_prompt_text = prompt_text
+                        content_surface.blit(cached_prompt_surf, (8, content_surface.get_height() - 24))
+
+                # Blit window background + title bar onto screen
+                w.draw(screen, font)
+                # Blit the content surface (this will include semi-transparent fill)
+                screen.blit(content_surface, (w.rect.x, w.rect.y + w.title_height))
+
+            # Mouse pointer handling (change cursor when over titlebar or entries)
+            mouse_x, mouse_y = pygame.mouse.get_pos()
+            cursor = pygame.SYSTEM_CURSOR_ARROW
+            for w in windows:
+                if w.title_bar_rect.collidepoint((mouse_x, mouse_y)):
+                    cursor = pygame.SYSTEM_CURSOR_HAND
+                    break
+            # If hovering a log entry
+            for rect, x_val, y_val, z_val, comment in entry_rects:
+                if rect.collidepoint((mouse_x, mouse_y)):
+                    cursor = pygame.SYSTEM_CURSOR_HAND
+                    break
+            # Hand the cursor to SDL only on change, not once per frame
+            if cursor != current_cursor:
+                pygame.mouse.set_system_cursor(cursor)
+                current_cursor = cursor
+
+            pygame.display.flip()
 
         # -----------------------
         # EVENTS
         # -----------------------
-        for event in pygame.event.get():
+        # Coalesce MOUSEMOTION: during a drag SDL can queue many motion
+        # events per frame, but only the final position matters for both
+        # window dragging and map panning.
+        motion_events = pygame.event.get(pygame.MOUSEMOTION)
+        if motion_events:
+            last_motion = motion_events[-1]
+            mx, my = last_motion.pos
+            # If a window is dragging, move it
+            for w in windows:
+                w.handle_drag((mx, my), screen_w, screen_h)
+            # If dragging the map, pan
+            if dragging_map:
+                dx = last_motion.pos[0] - drag_start[0]
+                dy = last_motion.pos[1] - drag_start[1]
+                target_offset_x = drag_offset_start[0] + dx
+                target_offset_y = drag_offset_start[1] + dy
+                target_offset_x, target_offset_y = clamp_offset(target_offset_x, target_offset_y, tile_bounds, large_rect.width, large_rect.height, zoom_float / current_zoom)
+
+        events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
 
@@ -431,14 +747,16 @@ def main():
                         saved_x = map_x
                         saved_y = map_y
                         saved_zoom = zoom_float
-                        log_entries.append((saved_x, saved_y, saved_zoom, current_comment))
-                        # Create a marker for this entry
-                        markers.append({
-                            "x": saved_x,
-                            "y": saved_y,
-                            "zoom": saved_zoom,
-                            "comment": current_comment
-                        })
+                        text_surf = small_font.render(
+                            f"X:{saved_x:.2f} Y:{saved_y:.2f} Z:{saved_zoom:.2f} {current_comment}",
+                            True, (230, 230, 230)).convert_alpha()
+                        log_entries.append((saved_x, saved_y, saved_zoom, current_comment, text_surf))
+                        # Create a marker for this entry (appends are rare —
+                        # one per log entry — so growing the arrays is fine)
+                        marker_xs = np.append(marker_xs, np.float32(saved_x))
+                        marker_ys = np.append(marker_ys, np.float32(saved_y))
+                        marker_zooms = np.append(marker_zooms, np.float32(saved_zoom))
+                        marker_comments.append(current_comment)
                         current_comment = ""
                         typing_comment = False
                     else:
@@ -489,7 +807,7 @@ def main():
                                         target_offset_x = large_rect.width / 2 - (saved_x * TILE_SIZE * (target_zoom / current_zoom))
                                         target_offset_y = large_rect.height / 2 - (saved_y * TILE_SIZE * (target_zoom / current_zoom))
                                         # clamp offsets for that zoom
-                                        target_offset_x, target_offset_y = clamp_offset(target_offset_x, target_offset_y, tiles, large_rect.width, large_rect.height, target_zoom / current_zoom)
+                                        target_offset_x, target_offset_y = clamp_offset(target_offset_x, target_offset_y, tile_bounds, large_rect.width, large_rect.height, target_zoom / current_zoom)
                                         break
                             break
 
@@ -508,19 +826,6 @@ def main():
                 active_window = None
                 dragging_map = False
 
-            elif event.type == pygame.MOUSEMOTION:
-                mx, my = event.pos
-                # If a window is dragging, move it
-                for w in windows:
-                    w.handle_drag((mx, my), screen_w, screen_h)
-                # If dragging the map, pan
-                if dragging_map:
-                    dx = event.pos[0] - drag_start[0]
-                    dy = event.pos[1] - drag_start[1]
-                    target_offset_x = drag_offset_start[0] + dx
-                    target_offset_y = drag_offset_start[1] + dy
-                    target_offset_x, target_offset_y = clamp_offset(target_offset_x, target_offset_y, tiles, large_rect.width, large_rect.height, zoom_float / current_zoom)
-
             elif event.type == pygame.MOUSEWHEEL:
                 mx, my = pygame.mouse.get_pos()
                 zoom_change = 1 if event.y > 0 else -1
@@ -531,7 +836,7 @@ def main():
                 target_offset_x = mx - zoom_ratio * (mx - target_offset_x)
                 target_offset_y = my - zoom_ratio * (my - target_offset_y)
                 target_zoom = new_target_zoom
-                target_offset_x, target_offset_y = clamp_offset(target_offset_x, target_offset_y, tiles, large_rect.width, large_rect.height, new_target_zoom / current_zoom)
+                target_offset_x, target_offset_y = clamp_offset(target_offset_x, target_offset_y, tile_bounds, large_rect.width, large_rect.height, new_target_zoom / current_zoom)
 
         # -----------------------
         # SMOOTH ZOOM & PAN
@@ -542,13 +847,23 @@ def main():
         zoom_float = max(MIN_ZOOM, min(MAX_ZOOM, zoom_float))
         new_zoom_int = int(round(zoom_float))
         if new_zoom_int != current_zoom:
-            new_tiles = load_tiles(new_zoom_int)
-            if new_tiles:
-                tiles = new_tiles
+            new_store = TileStore(new_zoom_int)
+            if new_store:
+                tile_store = new_store
+                tile_bounds = tile_store.bounds
+                tile_xs, tile_ys = tile_store.xs, tile_store.ys
                 scaled_tiles_cache.clear()
                 current_zoom = new_zoom_int
 
-        clock.tick(60)
+        # Full rate while interacting or animating, half rate when idle.
+        animating = (dragging_map or active_window is not None
+                     or abs(offset_x - target_offset_x) > 0.5
+                     or abs(offset_y - target_offset_y) > 0.5
+                     or abs(zoom_float - target_zoom) > 0.01)
+        # Any event (including WINDOWEXPOSED redraw requests) or ongoing
+        # animation means the next frame must actually be drawn.
+        dirty = bool(events) or bool(motion_events) or animating
+        clock.tick(60 if animating else 30)
 
     pygame.quit()
 
@@ -1,42 +1,174 @@
+import math
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
 import pygame
 import numpy as np
 import pygame.surfarray
 
+# Pillow's webp decoder (SIMD-accelerated in pillow-simd builds) beats the
+# SDL_image route; it is optional and we fall back to pygame.image.load.
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
 TILE_DIR = "tiles"
 TILE_SIZE = 256
+MIP_SIZES = (256, 128, 64, 32)  # power-of-2 pyramid built per tile at load
+SCALED_CACHE_MAX = 256  # max animation-time scaled surfaces kept alive (LRU)
+MISSING_CACHE_MAX = 128  # max missing-tile placeholder surfaces (LRU)
+ATLAS_MAX_TILES = 256   # don't compose atlases past this grid size (memory)
 START_ZOOM = 2
 MIN_ZOOM = 2
 MAX_ZOOM = 5
 SMOOTH_SPEED = 0.2  # smooth pan & zoom speed
 
+# Discrete render-zoom ladder: the lerped zoom_float snaps to these for
+# drawing, so animation frames repeat cache keys instead of producing a
+# fresh scale per frame. Integer zooms are on the ladder, so the settled
+# state still hits the native (unscaled) path.
+ZOOM_LADDER = tuple(i + f for i in range(MIN_ZOOM, MAX_ZOOM)
+                    for f in (0.0, 0.25, 0.5, 0.75)) + (float(MAX_ZOOM),)
+
+
+def snap_zoom(z):
+    """Snap a lerped zoom to the nearest ZOOM_LADDER step."""
+    return min(ZOOM_LADDER, key=lambda step: abs(step - z))
+
+# fblits is the fastest batched blit (pygame-ce); fall back to blits on stock pygame
+if hasattr(pygame.Surface, "fblits"):
+    def blit_batch(surface, seq):
+        surface.fblits(seq)
+else:
+    def blit_batch(surface, seq):
+        surface.blits(seq, doreturn=0)
+
 
 # ----------------------------------------------------------
 # LOAD TILES
 # ----------------------------------------------------------
-def load_tiles(zoom):
-    tiles = {}
+# pygame-ce ships a SIMD grayscale; together with a BLEND_RGB_SUB blit the
+# whole filter runs inside SDL's C blitters. Stock pygame falls back to the
+# fused numpy pass.
+if hasattr(pygame.transform, "grayscale"):
+    def invert_tile(surf):
+        """Return an inverted-grayscale copy of a tile surface."""
+        inv = pygame.Surface(surf.get_size())
+        inv.fill((255, 255, 255))
+        inv.blit(surf, (0, 0), special_flags=pygame.BLEND_RGB_SUB)  # white - tile
+        return pygame.transform.grayscale(inv)
+else:
+    def invert_tile(surf):
+        """Return an inverted-grayscale copy of a tile surface."""
+        inv = surf.copy()
+        arr = pygame.surfarray.pixels3d(inv)
+        # Rec.601 luminance on the inverted channels: integer weights and a
+        # shift, one uint16 pass, no float64 mean and no division.
+        a = arr.astype(np.uint16)
+        gray = ((77 * (255 - a[..., 0])
+                 + 150 * (255 - a[..., 1])
+                 + 29 * (255 - a[..., 2])) >> 8).astype(np.uint8)
+        arr[..., 0] = gray
+        arr[..., 1] = gray
+        arr[..., 2] = gray
+        del arr
+        return inv
+
+
+def build_mipmaps(surf):
+    """Return the power-of-2 downscale pyramid for one tile surface."""
+    levels = [surf]
+    for size in MIP_SIZES[1:]:
+        levels.append(pygame.transform.smoothscale(levels[-1], (size, size)))
+    return levels
+
+
+def decode_tiles(zoom):
+    """Scan a zoom directory and decode its webp tiles to raw surfaces.
+
+    Returns a list of (x, y, raw_surface). This half is safe off the main
+    thread: it only does file IO and image decoding, never anything that
+    touches the display.
+    """
+    decoded = []
     zoom_dir = os.path.join(TILE_DIR, str(zoom))
     if not os.path.exists(zoom_dir):
-        return tiles
-    for x_name in os.listdir(zoom_dir):
-        x_path = os.path.join(zoom_dir, x_name)
-        if not os.path.isdir(x_path):
-            continue
-        for y_name in os.listdir(x_path):
-            if not y_name.endswith(".webp"):
+        return decoded
+    # scandir DirEntry objects carry cached stat info, so is_dir() and
+    # .path cost no extra syscalls the way listdir + isdir + join did.
+    entries = []
+    with os.scandir(zoom_dir) as x_iter:
+        for x_entry in x_iter:
+            if not x_entry.is_dir():
                 continue
-            y_path = os.path.join(x_path, y_name)
             try:
-                x_index = int(x_name)
-                y_index = int(y_name.replace(".webp", ""))
+                x_index = int(x_entry.name)
             except ValueError:
                 continue
-            try:
-                tiles[(x_index, y_index)] = pygame.image.load(y_path).convert_alpha()
-            except Exception as e:
-                print(f"Failed to load {y_path}: {e}")
-    return tiles
+            with os.scandir(x_entry.path) as y_iter:
+                for y_entry in y_iter:
+                    if not y_entry.name.endswith(".webp"):
+                        continue
+                    try:
+                        y_index = int(y_entry.name[:-len(".webp")])
+                    except ValueError:
+                        continue
+                    entries.append((x_index, y_index, y_entry.path))
+
+    def decode(entry):
+        x_index, y_index, y_path = entry
+        try:
+            if Image is not None:
+                im = Image.open(y_path).convert("RGBA")
+                return x_index, y_index, pygame.image.frombuffer(im.tobytes(), im.size, "RGBA")
+            return x_index, y_index, pygame.image.load(y_path)
+        except Exception as e:
+            print(f"Failed to load {y_path}: {e}")
+            return x_index, y_index, None
+
+    # The webp decode inside SDL_image releases the GIL, so a thread pool
+    # overlaps disk IO and decoding across cores.
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+        for x_index, y_index, raw in ex.map(decode, entries):
+            if raw is not None:
+                decoded.append((x_index, y_index, raw))
+    return decoded
+
+
+def finish_tiles(decoded):
+    """Turn decoded raw surfaces into display-format mipmap pyramids.
+
+    Returns (tiles, tiles_inv, bounds): each tile maps to its pyramid
+    (see build_mipmaps) so the draw loop can stretch-blit from the
+    nearest prebuilt level instead of smoothscaling the full-size tile
+    per frame; tiles_inv holds inverted-grayscale pyramids so the invert
+    filter is a load-time cost; bounds is (min_x, max_x, min_y, max_y)
+    or None when no tiles exist. convert() and the pyramid/invert blits
+    need the video context, so this half always runs on the main thread
+    — convert() not convert_alpha() because the tiles are fully opaque
+    and the alpha-free format takes the fast opaque blit path.
+    """
+    tiles = {}
+    tiles_inv = {}
+    for x_index, y_index, raw in decoded:
+        levels = build_mipmaps(raw.convert())
+        tiles[(x_index, y_index)] = levels
+        tiles_inv[(x_index, y_index)] = [invert_tile(l) for l in levels]
+    if not tiles:
+        return tiles, tiles_inv, None
+    xs = [x for x, y in tiles.keys()]
+    ys = [y for x, y in tiles.keys()]
+    bounds = (min(xs), max(xs), min(ys), max(ys))
+    return tiles, tiles_inv, bounds
+
+
+def load_tiles(zoom):
+    """Decode and finish a whole zoom level synchronously (startup path)."""
+    return finish_tiles(decode_tiles(zoom))
 
 
 # ----------------------------------------------------------
@@ -50,31 +182,104 @@ def draw_dotted_line(surface, color, start, end, dash_length=10):
         return
     dx = (x2 - x1) / length
     dy = (y2 - y1) / length
-    for i in range(0, length, dash_length * 2):
-        sx = int(x1 + dx * i)
-        sy = int(y1 + dy * i)
-        ex = int(x1 + dx * (i + dash_length))
-        ey = int(y1 + dy * (i + dash_length))
-        pygame.draw.line(surface, color, (sx, sy), (ex, ey))
+    # Compute every dash endpoint in a few ufunc passes instead of four
+    # float multiplies + int casts per dash in Python.
+    steps = np.arange(0, length, dash_length * 2)
+    sxs = (x1 + dx * steps).astype(np.int32)
+    sys_ = (y1 + dy * steps).astype(np.int32)
+    exs = (x1 + dx * (steps + dash_length)).astype(np.int32)
+    eys = (y1 + dy * (steps + dash_length)).astype(np.int32)
+    line = pygame.draw.line
+    for sx, sy, ex, ey in zip(sxs.tolist(), sys_.tolist(), exs.tolist(), eys.tolist()):
+        line(surface, color, (sx, sy), (ex, ey))
+
+
+def build_grid(tiles, bounds):
+    """Pack a tiles dict into a 2D object ndarray indexed [x-min_x, y-min_y].
+
+    The inner draw loop then does one C-speed array getitem per cell
+    instead of a tuple hash for the membership test plus another for the
+    lookup. Missing cells stay None.
+    """
+    if bounds is None:
+        return None
+    min_x, max_x, min_y, max_y = bounds
+    arr = np.empty((max_x - min_x + 1, max_y - min_y + 1), dtype=object)
+    for (x, y), levels in tiles.items():
+        arr[x - min_x, y - min_y] = levels
+    return arr
+
+
+def build_atlas(src_tiles, bounds, font):
+    """Compose a zoom level's tiles into one surface for steady-state blits.
+
+    At native zoom the draw loop then does a single blit instead of one
+    per tile. Missing cells get the same gray rect + coordinate label the
+    per-tile fallback draws. Returns None past ATLAS_MAX_TILES — a deep
+    level's atlas would cost hundreds of MB, where per-tile blitting is
+    the better trade.
+    """
+    min_x, max_x, min_y, max_y = bounds
+    nx, ny = max_x - min_x + 1, max_y - min_y + 1
+    if nx * ny > ATLAS_MAX_TILES:
+        return None
+    atlas = pygame.Surface((nx * TILE_SIZE, ny * TILE_SIZE))
+    for x in range(min_x, max_x + 1):
+        for y in range(min_y, max_y + 1):
+            ax, ay = (x - min_x) * TILE_SIZE, (y - min_y) * TILE_SIZE
+            levels = src_tiles.get((x, y))
+            if levels is not None:
+                atlas.blit(levels[0], (ax, ay))
+            else:
+                rect = pygame.Rect(ax, ay, TILE_SIZE, TILE_SIZE)
+                pygame.draw.rect(atlas, (70, 70, 70), rect)
+                text = render_label(font, f"{x},{y}", (0, 0, 0))
+                atlas.blit(text, text.get_rect(center=rect.center))
+    return atlas.convert()
+
+
+def background_load(zoom, result):
+    """Run decode_tiles off the render thread and drop the result in a list.
+
+    Only the decode half runs here; the render loop polls the list, does
+    the display-format finish_tiles pass itself (that needs the video
+    context and must not race set_mode on a resize), and swaps the
+    visible tile set atomically between frames.
+    """
+    result.append(decode_tiles(zoom))
+
+
+@lru_cache(maxsize=512)
+def render_label(font, text, color):
+    """Memoized font.render: axis labels and HUD strings repeat every frame."""
+    return font.render(text, True, color)
 
 
 def lerp(a, b, t):
     return a + (b - a) * t
 
 
-def clamp_offset(offset_x, offset_y, tiles, screen_w, screen_h, zoom_scale=1.0):
-    if not tiles:
-        return offset_x, offset_y
-    xs = [x for x, y in tiles.keys()]
-    ys = [y for x, y in tiles.keys()]
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
-    map_w = (max_x - min_x + 1) * TILE_SIZE * zoom_scale
-    map_h = (max_y - min_y + 1) * TILE_SIZE * zoom_scale
+@lru_cache(maxsize=32)
+def _offset_limits(bounds, screen_w, screen_h, zoom_scale):
+    """Pure helper: the four pan limits for a (bounds, screen, zoom) combo.
+
+    Memoized because a drag fires dozens of MOUSEMOTION clamps per frame
+    with identical inputs.
+    """
+    min_x, max_x, min_y, max_y = bounds
     max_x_off = -min_x * TILE_SIZE * zoom_scale
     min_x_off = screen_w - ((max_x + 1) * TILE_SIZE * zoom_scale)
     max_y_off = -min_y * TILE_SIZE * zoom_scale
     min_y_off = screen_h - ((max_y + 1) * TILE_SIZE * zoom_scale)
+    return min_x_off, max_x_off, min_y_off, max_y_off
+
+
+def clamp_offset(offset_x, offset_y, bounds, screen_w, screen_h, zoom_scale=1.0):
+    """Clamp pan offsets to the map edges. O(1): bounds come from load_tiles."""
+    if bounds is None:
+        return offset_x, offset_y
+    min_x_off, max_x_off, min_y_off, max_y_off = _offset_limits(
+        bounds, screen_w, screen_h, zoom_scale)
     return max(min_x_off, min(max_x_off, offset_x)), max(min_y_off, min(max_y_off, offset_y))
 
 
@@ -85,7 +290,14 @@ def main():
     invert_enabled = False  # start with invert off
     pygame.init()
     screen_w, screen_h = 1024, 768
-    screen = pygame.display.set_mode((screen_w, screen_h), pygame.RESIZABLE)
+    # SCALED hands the final present to SDL's GPU renderer and lets vsync
+    # pace the loop; fall back to the plain software window where the
+    # driver can't do either.
+    try:
+        screen = pygame.display.set_mode(
+            (screen_w, screen_h), pygame.RESIZABLE | pygame.SCALED, vsync=1)
+    except pygame.error:
+        screen = pygame.display.set_mode((screen_w, screen_h), pygame.RESIZABLE)
     pygame.display.set_caption("DayZ Tile Map Viewer")
 
     # ----------------------------------------------------------
@@ -97,171 +309,240 @@ def main():
         font = pygame.font.SysFont("Consolas", 18, bold=True)
 
     current_zoom = START_ZOOM
-    tiles = load_tiles(current_zoom)
-    scaled_tiles_cache = {}
+    tiles, tiles_inv, tile_bounds = load_tiles(current_zoom)
+    tiles_grid = build_grid(tiles, tile_bounds)
+    tiles_inv_grid = build_grid(tiles_inv, tile_bounds)
+    grid_overlay_cache = {}  # grid+label overlay keyed on span/offsets/visible range
+    # Scaled surfaces produced during zoom animation, LRU-bounded so a
+    # long session can't accumulate stale sizes without limit.
+    scaled_tiles_cache = OrderedDict()  # (x, y, tile_px, inverted) -> Surface
+    atlases = {}  # invert_enabled -> composed atlas (or None when too large)
+    missing_cache = OrderedDict()  # (x, y, tile_px) -> placeholder Surface
 
     offset_x = offset_y = target_offset_x = target_offset_y = 0.0
     zoom_float = target_zoom = current_zoom
     dragging = False
     drag_start = drag_offset_start = (0, 0)
+    zoom_loading = None  # zoom level currently decoding in the background
+    zoom_result = []
 
     clock = pygame.time.Clock()
     running = True
 
-    while running:
-        screen.fill((0, 0, 0))
-        zoom_scale = zoom_float / current_zoom
+    # Dirty-flag rendering: draw only when input arrived or the pan/zoom
+    # animation is still converging.
+    dirty = True
 
-        # ----------------------------------------------------------
-        # DRAW TILES
-        # ----------------------------------------------------------
-        if tiles:
-            xs = [x for x, y in tiles.keys()]
-            ys = [y for x, y in tiles.keys()]
-            min_x, max_x = min(xs), max(xs)
-            min_y, max_y = min(ys), max(ys)
-
-            start_x = max(min_x, int(-offset_x / (TILE_SIZE * zoom_scale)))
-            end_x = min(max_x, int((screen_w - offset_x) / (TILE_SIZE * zoom_scale)) + 1)
-            start_y = max(min_y, int(-offset_y / (TILE_SIZE * zoom_scale)))
-            end_y = min(max_y, int((screen_h - offset_y) / (TILE_SIZE * zoom_scale)) + 1)
-
-            for x in range(start_x, end_x + 1):
-                for y in range(start_y, end_y + 1):
-                    px = int(x * TILE_SIZE * zoom_scale + offset_x)
-                    py = int(y * TILE_SIZE * zoom_scale + offset_y)
-                    key = (x, y, int(zoom_float * 100))
-
-                    if (x, y) in tiles:
-                        if key not in scaled_tiles_cache:
-                            scaled_tiles_cache[key] = pygame.transform.smoothscale(
-                                tiles[(x, y)],
-                                (int(TILE_SIZE * zoom_scale), int(TILE_SIZE * zoom_scale))
-                            )
-                        screen.blit(scaled_tiles_cache[key], (px, py))
-                    else:
-                        rect = pygame.Rect(px, py, int(TILE_SIZE * zoom_scale), int(TILE_SIZE * zoom_scale))
-                        pygame.draw.rect(screen, (70, 70, 70), rect)
-                        text = font.render(f"{x},{y}", True, (0, 0, 0))
-                        screen.blit(text, text.get_rect(center=rect.center))
+    while running:
+        # Idle frames (no events, animation settled) keep the frame
+        # already on screen: skip the draw pass and the flip entirely.
+        if dirty:
+            # Inverted mode blits the precomputed inverted-gray tiles, so the
+            # background just needs the inverted shade of black.
+            screen.fill((255, 255, 255) if invert_enabled else (0, 0, 0))
+            # Render with the snapped zoom so every cache downstream (scaled
+            # tiles, placeholders, grid overlay) sees a handful of repeating
+            # keys during the animation; the HUD below keeps the smooth
+            # zoom_float so the altitude readout doesn't step.
+            zoom_scale = snap_zoom(zoom_float) / current_zoom
+            src_tiles = tiles_inv if invert_enabled else tiles
+            src_grid = tiles_inv_grid if invert_enabled else tiles_grid
 
             # ----------------------------------------------------------
-            # GRID (dotted)
+            # DRAW TILES
             # ----------------------------------------------------------
-            grid_color = (0, 0, 0)
-
-            for x in range(start_x, end_x + 1):
-                px = int(x * TILE_SIZE * zoom_scale + offset_x)
-                draw_dotted_line(screen, grid_color, (px, 0), (px, screen_h))
-
-            for y in range(start_y, end_y + 1):
-                py = int(y * TILE_SIZE * zoom_scale + offset_y)
-                draw_dotted_line(screen, grid_color, (0, py), (screen_w, py))
+            if tiles:
+                min_x, max_x, min_y, max_y = tile_bounds
+
+                # One scaled tile span feeds the culling bounds and everything
+                # below; recomputing TILE_SIZE * zoom_scale per expression was
+                # the most-repeated float math in the frame.
+                tile_span = TILE_SIZE * zoom_scale
+                start_x = max(min_x, int(-offset_x / tile_span))
+                end_x = min(max_x, int((screen_w - offset_x) / tile_span) + 1)
+                start_y = max(min_y, int(-offset_y / tile_span))
+                end_y = min(max_y, int((screen_h - offset_y) / tile_span) + 1)
+
+                # Collect the visible tiles into one list and blit them with a
+                # single batched call; only the (rare) missing-tile fallback
+                # still draws per cell since it needs a rect + label.
+                # At native zoom (the settled state) no scaling happens at all
+                # — the full-size originals are blitted directly. While the
+                # zoom lerp is in flight, pick the nearest prebuilt mipmap
+                # level and let transform.scale do the fractional resample,
+                # so the per-frame resample touches a fraction of the pixels
+                # a full-size smoothscale did.
+                tile_px = int(tile_span)
+                native = abs(zoom_scale - 1.0) < 1e-3
+                lvl = 0
+                if zoom_scale < 1.0:
+                    lvl = min(len(MIP_SIZES) - 1, int(-math.log2(zoom_scale)))
+                # Steady state: blit the whole level as one pre-composed atlas
+                # (one contiguous SDL blit) instead of a tile loop. Levels too
+                # large to compose keep the per-tile path.
+                drew_atlas = False
+                if native:
+                    if invert_enabled not in atlases:
+                        atlases[invert_enabled] = build_atlas(src_tiles, tile_bounds, font)
+                    atlas = atlases[invert_enabled]
+                    if atlas is not None:
+                        screen.blit(atlas, (int(min_x * TILE_SIZE + offset_x),
+                                            int(min_y * TILE_SIZE + offset_y)))
+                        drew_atlas = True
+                if not drew_atlas:
+                    # Walk the grid with integer strides: the corner position is
+                    # computed once and every step adds the tile pixel size,
+                    # replacing two float multiplies + int casts per tile. Tiles
+                    # abut exactly since they are scaled to tile_px anyway.
+                    px0 = int(start_x * tile_span + offset_x)
+                    py0 = int(start_y * tile_span + offset_y)
+                    blit_list = []
+                    px = px0
+                    for x in range(start_x, end_x + 1):
+                        py = py0
+                        for y in range(start_y, end_y + 1):
+                            levels = src_grid[x - min_x, y - min_y]
+                            if levels is not None:
+                                if native:
+                                    blit_list.append((levels[0], (px, py)))
+                                else:
+                                    key = (x, y, tile_px, invert_enabled)
+                                    scaled = scaled_tiles_cache.get(key)
+                                    if scaled is None:
+                                        scaled = pygame.transform.scale(levels[lvl], (tile_px, tile_px))
+                                        scaled_tiles_cache[key] = scaled
+                                        while len(scaled_tiles_cache) > SCALED_CACHE_MAX:
+                                            scaled_tiles_cache.popitem(last=False)
+                                    else:
+                                        scaled_tiles_cache.move_to_end(key)
+                                    blit_list.append((scaled, (px, py)))
+                            else:
+                                # Missing cells reuse a cached placeholder (grey
+                                # square + label) and ride the batched blit with
+                                # everything else instead of two draws per frame.
+                                key = (x, y, tile_px)
+                                ph = missing_cache.get(key)
+                                if ph is None:
+                                    ph = pygame.Surface((tile_px, tile_px))
+                                    ph.fill((70, 70, 70))
+                                    text = render_label(font, f"{x},{y}", (0, 0, 0))
+                                    ph.blit(text, text.get_rect(center=(tile_px // 2, tile_px // 2)))
+                                    missing_cache[key] = ph
+                                    while len(missing_cache) > MISSING_CACHE_MAX:
+                                        missing_cache.popitem(last=False)
+                                else:
+                                    missing_cache.move_to_end(key)
+                                blit_list.append((ph, (px, py)))
+                            py += tile_px
+                        px += tile_px
+                    blit_batch(screen, blit_list)
+
+                # ----------------------------------------------------------
+                # GRID (dotted) + AXIS LABELS (mil green)
+                # ----------------------------------------------------------
+                # Both are fully determined by the tile pixel size, the
+                # offsets modulo one tile, and which tile indices are on
+                # screen, so compose them into one transparent overlay and
+                # blit that — one blit per frame instead of the dotted-line
+                # work plus a label blit per visible row and column.
+                grid_color = (0, 0, 0)
+                axis_color = (60, 60, 60)
+                ox_mod = int(offset_x) % tile_px
+                oy_mod = int(offset_y) % tile_px
+                # The labels sit at absolute int(x * tile_span + offset_x)
+                # positions, and when the map is smaller than the window
+                # start_x/start_y clamp at the bounds, so the key has to
+                # carry the first label's pixel position and the last index
+                # — offsets exactly one tile apart would otherwise collide.
+                base_px = int(start_x * tile_span + offset_x)
+                base_py = int(start_y * tile_span + offset_y)
+                gkey = (tile_span, ox_mod, oy_mod, base_px, base_py,
+                        start_x, start_y, end_x, end_y, screen_w, screen_h)
+                overlay = grid_overlay_cache.get(gkey)
+                if overlay is None:
+                    overlay = pygame.Surface((screen_w, screen_h), pygame.SRCALPHA)
+                    for gpx in range(ox_mod - tile_px, screen_w + tile_px, tile_px):
+                        draw_dotted_line(overlay, grid_color, (gpx, 0), (gpx, screen_h))
+                    for gpy in range(oy_mod - tile_px, screen_h + tile_px, tile_px):
+                        draw_dotted_line(overlay, grid_color, (0, gpy), (screen_w, gpy))
+                    for x in range(start_x, end_x + 1):
+                        gpx = int(x * tile_span + offset_x)
+                        overlay.blit(render_label(font, str(x), axis_color), (gpx + 5, 5))
+                    for y in range(start_y, end_y + 1):
+                        gpy = int(y * tile_span + offset_y)
+                        overlay.blit(render_label(font, str(y), axis_color), (5, gpy + 5))
+                    if len(grid_overlay_cache) > 32:
+                        grid_overlay_cache.clear()
+                    grid_overlay_cache[gkey] = overlay
+                screen.blit(overlay, (0, 0))
 
             # ----------------------------------------------------------
-            # AXIS LABELS (mil green)
+            # HUD ALTITUDE (military style)
             # ----------------------------------------------------------
-            axis_color = (60, 60, 60)
-
-            for x in range(start_x, end_x + 1):
-                px = int(x * TILE_SIZE * zoom_scale + offset_x)
-                label = font.render(str(x), True, axis_color)
-                screen.blit(label, (px + 5, 5))
+            altitude_km = 2 / zoom_float * 400
+            hud_text = f"ALT {altitude_km:06.2f} KM"
+            hud_surf = render_label(font, hud_text, (0, 255, 0))
 
-            for y in range(start_y, end_y + 1):
-                py = int(y * TILE_SIZE * zoom_scale + offset_y)
-                label = font.render(str(y), True, axis_color)
-                screen.blit(label, (5, py + 5))
+            bg = pygame.Surface((hud_surf.get_width() + 16, hud_surf.get_height() + 12))
+            bg.set_alpha(120)
+            bg.fill((0, 40, 0))
+            screen.blit(bg, (screen_w - bg.get_width() - 20, 20))
+            screen.blit(hud_surf, (screen_w - hud_surf.get_width() - 12, 26))
 
             # ----------------------------------------------------------
-            # INVERT FILTER (tiles + grid, before HUD)
+            # SCALE BAR (bottom-left)
             # ----------------------------------------------------------
-            if invert_enabled:
-                # Copy the current screen (tiles + grid)
-                tile_surface = screen.copy()
-                
-                # Get pixel array
-                arr = pygame.surfarray.pixels3d(tile_surface)
-                
-                # Invert colors
-                np.subtract(255, arr, out=arr)
-                
-                # Convert to grayscale: average the RGB channels
-                gray = arr.mean(axis=2, keepdims=True).astype(np.uint8)
-                arr[:] = gray  # broadcast grayscale to all channels
-                
-                del arr  # unlock surface
-                screen.blit(tile_surface, (0, 0))
-
-
-
-
-        # ----------------------------------------------------------
-        # HUD ALTITUDE (military style)
-        # ----------------------------------------------------------
-        altitude_km = 2 / zoom_float * 400
-        hud_text = f"ALT {altitude_km:06.2f} KM"
-        hud_surf = font.render(hud_text, True, (0, 255, 0))
-
-        bg = pygame.Surface((hud_surf.get_width() + 16, hud_surf.get_height() + 12))
-        bg.set_alpha(120)
-        bg.fill((0, 40, 0))
-        screen.blit(bg, (screen_w - bg.get_width() - 20, 20))
-        screen.blit(hud_surf, (screen_w - hud_surf.get_width() - 12, 26))
-
-        # ----------------------------------------------------------
-        # SCALE BAR (bottom-left)
-        # ----------------------------------------------------------
-        tile_distance_km = 0.98 * (altitude_km / 50.0)
-        tile_distance_m = max(tile_distance_km * 1000, 1)
+            tile_distance_km = 0.98 * (altitude_km / 50.0)
+            tile_distance_m = max(tile_distance_km * 1000, 1)
 
-        nice_units_m = [50, 100, 200, 500, 1000, 2000, 5000, 10000]
-        best_unit_m = nice_units_m[-1]
-        for u in nice_units_m:
-            if u >= tile_distance_m * 0.3:
-                best_unit_m = u
-                break
+            nice_units_m = [50, 100, 200, 500, 1000, 2000, 5000, 10000]
+            best_unit_m = nice_units_m[-1]
+            for u in nice_units_m:
+                if u >= tile_distance_m * 0.3:
+                    best_unit_m = u
+                    break
 
-        pixels_per_tile = TILE_SIZE * zoom_scale
-        px_per_m = pixels_per_tile / tile_distance_m
-        scale_bar_px = int(best_unit_m * px_per_m)
-        scale_bar_px = max(40, min(scale_bar_px, int(screen_w * 0.4)))
+            pixels_per_tile = TILE_SIZE * zoom_scale
+            px_per_m = pixels_per_tile / tile_distance_m
+            scale_bar_px = int(best_unit_m * px_per_m)
+            scale_bar_px = max(40, min(scale_bar_px, int(screen_w * 0.4)))
 
-        if best_unit_m < 1000:
-            distance_text = f"{best_unit_m} M"
-        else:
-            distance_text = f"{best_unit_m/1000:.1f} KM"
+            if best_unit_m < 1000:
+                distance_text = f"{best_unit_m} M"
+            else:
+                distance_text = f"{best_unit_m/1000:.1f} KM"
 
-        pad_x = 12
-        pad_y = 8
-        font_h = font.get_linesize()
-        box_w = scale_bar_px + pad_x * 2
-        box_h = font_h + pad_y * 2 + 6
+            pad_x = 12
+            pad_y = 8
+            font_h = font.get_linesize()
+            box_w = scale_bar_px + pad_x * 2
+            box_h = font_h + pad_y * 2 + 6
 
-        box_x = 20
-        box_y = screen_h - box_h - 20
+            box_x = 20
+            box_y = screen_h - box_h - 20
 
-        bg_surf = pygame.Surface((box_w, box_h), pygame.SRCALPHA)
-        bg_surf.fill((0, 40, 0, 150))
-        screen.blit(bg_surf, (box_x, box_y))
+            bg_surf = pygame.Surface((box_w, box_h), pygame.SRCALPHA)
+            bg_surf.fill((0, 40, 0, 150))
+            screen.blit(bg_surf, (box_x, box_y))
 
-        sx = box_x + pad_x
-        sy = box_y + box_h - pad_y - 6
-        ex = sx + scale_bar_px
+            sx = box_x + pad_x
+            sy = box_y + box_h - pad_y - 6
+            ex = sx + scale_bar_px
 
-        pygame.draw.line(screen, (0, 255, 0), (sx, sy), (ex, sy), 4)
-        pygame.draw.line(screen, (0, 255, 0), (sx, sy - 8), (sx, sy + 8), 3)
-        pygame.draw.line(screen, (0, 255, 0), (ex, sy - 8), (ex, sy + 8), 3)
+            pygame.draw.line(screen, (0, 255, 0), (sx, sy), (ex, sy), 4)
+            pygame.draw.line(screen, (0, 255, 0), (sx, sy - 8), (sx, sy + 8), 3)
+            pygame.draw.line(screen, (0, 255, 0), (ex, sy - 8), (ex, sy + 8), 3)
 
-        lbl = font.render(distance_text, True, (0, 255, 0))
-        screen.blit(lbl, (sx, box_y + 5))
+            lbl = render_label(font, distance_text, (0, 255, 0))
+            screen.blit(lbl, (sx, box_y + 5))
 
-        pygame.display.flip()
+            pygame.display.flip()
 
         # ----------------------------------------------------------
         # EVENTS
         # ----------------------------------------------------------
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
 
@@ -271,7 +552,11 @@ def main():
 
             elif event.type == pygame.VIDEORESIZE:
                 screen_w, screen_h = event.size
-                screen = pygame.display.set_mode((screen_w, screen_h), pygame.RESIZABLE)
+                try:
+                    screen = pygame.display.set_mode(
+                        (screen_w, screen_h), pygame.RESIZABLE | pygame.SCALED, vsync=1)
+                except pygame.error:
+                    screen = pygame.display.set_mode((screen_w, screen_h), pygame.RESIZABLE)
 
             elif event.type == pygame.MOUSEWHEEL:
                 mx, my = pygame.mouse.get_pos()
@@ -284,7 +569,7 @@ def main():
 
                 target_zoom = new_target_zoom
                 target_offset_x, target_offset_y = clamp_offset(
-                    target_offset_x, target_offset_y, tiles, screen_w, screen_h,
+                    target_offset_x, target_offset_y, tile_bounds, screen_w, screen_h,
                     zoom_scale=new_target_zoom / current_zoom
                 )
 
@@ -304,7 +589,7 @@ def main():
                 target_offset_y = drag_offset_start[1] + dy
 
                 target_offset_x, target_offset_y = clamp_offset(
-                    target_offset_x, target_offset_y, tiles, screen_w, screen_h,
+                    target_offset_x, target_offset_y, tile_bounds, screen_w, screen_h,
                     zoom_scale=zoom_float / current_zoom
                 )
 
@@ -317,13 +602,44 @@ def main():
         zoom_float = lerp(zoom_float, target_zoom, SMOOTH_SPEED)
         zoom_float = max(MIN_ZOOM, min(MAX_ZOOM, zoom_float))
 
+        # Zoom-level switches load in a background thread so the render
+        # loop keeps drawing the current level (rescaled) instead of
+        # stalling for the whole decode; the swap happens here once the
+        # loader finishes, and a result for a zoom the user has already
+        # left is simply discarded.
         new_zoom_int = int(round(zoom_float))
-        if new_zoom_int != current_zoom:
-            new_tiles = load_tiles(new_zoom_int)
-            if new_tiles:
+        if new_zoom_int != current_zoom and zoom_loading is None:
+            zoom_result = []
+            threading.Thread(target=background_load,
+                             args=(new_zoom_int, zoom_result),
+                             daemon=True).start()
+            zoom_loading = new_zoom_int
+        swapped_level = False
+        if zoom_loading is not None and zoom_result:
+            swapped_level = True
+            # finish_tiles (convert + pyramids + invert) happens here on
+            # the main thread; the worker only decoded.
+            new_tiles, new_tiles_inv, new_bounds = finish_tiles(zoom_result[0])
+            loaded_zoom = zoom_loading
+            zoom_loading = None
+            if new_tiles and loaded_zoom == new_zoom_int:
                 tiles = new_tiles
-                scaled_tiles_cache.clear()
-                current_zoom = new_zoom_int
+                tiles_inv = new_tiles_inv
+                tile_bounds = new_bounds
+                tiles_grid = build_grid(tiles, tile_bounds)
+                tiles_inv_grid = build_grid(tiles_inv, tile_bounds)
+                scaled_tiles_cache.clear()  # keys reference the old level's tiles
+                atlases.clear()
+                missing_cache.clear()
+                current_zoom = loaded_zoom
+
+        # Any event (including expose/resize), an in-flight animation, or a
+        # freshly swapped zoom level means the next frame must actually draw.
+        animating = (dragging
+                     or abs(offset_x - target_offset_x) > 0.5
+                     or abs(offset_y - target_offset_y) > 0.5
+                     or abs(zoom_float - target_zoom) > 0.01)
+        dirty = bool(events) or animating or swapped_level
 
         clock.tick(60)
 